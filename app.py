@@ -1,27 +1,48 @@
-import streamlit as st
-import requests
-import math
-from datetime import datetime, timedelta
-
 """
-Streamlit application for monitoring cryptocurrency markets in real-time and
- detecting emerging 5%+ price surges. The app fetches price data from the
- public Coingecko API at regular intervals, computes simple momentum-based
- features and extrapolates potential gains over the next 30 minutes. It
- surfaces the top five coins with the highest projected percentage increase
- and displays them in a table along with their projected gain. A history of
- prices is maintained in the session state so that trends can be visualised
- and used in the prediction logic. The dashboard automatically refreshes
- every minute to provide continuously updated insights.
+Streamlit application for monitoring cryptocurrency markets in real‑time and
+detecting emerging 5%+ price surges.  The app fetches price data from the
+public Coingecko API at regular intervals, computes simple momentum‑based
+features and extrapolates potential gains over the next 30 minutes.  It
+surfaces the top five coins with the highest projected percentage increase
+and displays them in a table along with their projected gain.  A history of
+prices is maintained in the session state so that trends can be visualised
+and used in the prediction logic.  The dashboard automatically refreshes
+every minute to provide continuously updated insights.
 
 The prediction algorithm implemented here is intentionally lightweight and
- heuristic. It examines the short-term returns of each coin (over the last
- 1, 5 and 15 minute windows) and projects them forward to estimate a 30
- minute gain. Coins whose projected gain exceeds five percent are
- highlighted. In a production setting you might replace this logic with
- a more sophisticated machine learning model trained on historical data.
+heuristic.  It examines the short‑term returns of each coin (over the last
+1, 5 and 15 minute windows) and projects them forward to estimate a 30
+minute gain.  Coins whose projected gain exceeds five percent are
+highlighted.  In a production setting you might replace this logic with
+a more sophisticated machine learning model trained on historical data.
 """
 
+import streamlit as st
+from streamlit_autorefresh import st_autorefresh
+import numpy as np
+import aiohttp
+import asyncio
+import heapq
+import orjson
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from kernel_version import load_aot_kernel
+
+# Prefer the ahead-of-time compiled prediction kernel (built by running
+# ``python kernel.py``) if it matches the current kernel.py; otherwise fall
+# back to kernel.py itself, which is JIT-compiled by Numba when available
+# and plain Python when not.
+project = load_aot_kernel()
+if project is None:
+    from kernel import project
+
+# List of cryptocurrencies to monitor.  These identifiers correspond to
+# Coingecko's API naming conventions.  You can adjust this list to
+# include any other coins that Coingecko supports.  Keeping the list
+# relatively small helps ensure the dashboard remains responsive on the
+# free tier of hosting services.
 COINS = [
     "bitcoin",
     "ethereum",
@@ -35,7 +56,116 @@ COINS = [
     "litecoin",
 ]
 
+# Human-friendly names for the coins above, computed once rather than on
+# every render.  Coins missing from this mapping fall back to a
+# title-cased version of their ID (see ``format_coin_name``).
+DISPLAY_NAMES = {
+    "bitcoin": "Bitcoin",
+    "ethereum": "Ethereum",
+    "binancecoin": "Binance Coin",
+    "ripple": "XRP",
+    "cardano": "Cardano",
+    "solana": "Solana",
+    "dogecoin": "Dogecoin",
+    "tron": "TRON",
+    "polkadot": "Polkadot",
+    "litecoin": "Litecoin",
+}
+
+@st.cache_resource
+def _event_loop():
+    """Start a background event loop shared by all sessions.
+
+    Streamlit runs each script in its own thread without an event loop.
+    Keeping one long-lived loop lets the aiohttp session below (which is
+    bound to the loop that created it) be reused across reruns.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+def _run(coro):
+    """Run a coroutine on the background loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
+
+@st.cache_resource
+def _client_session():
+    """Return a shared aiohttp session so connections and DNS are reused.
+
+    aiohttp closes idle connections after 15 seconds by default, which is
+    shorter than the refresh interval and would mean a new TCP and TLS
+    handshake every minute.  The keep-alive timeout is raised above the
+    refresh interval so the connection to Coingecko survives between
+    reruns.  The pool is sized for the concurrent backfill requests.
+    """
+    async def create():
+        connector = aiohttp.TCPConnector(limit=len(COINS), keepalive_timeout=90)
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers={"User-Agent": "crypto-surge-monitor/1.0"},
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    return _run(create())
+
+# Transient server errors worth retrying.  429 (rate limited) is handled
+# separately in fetch_prices by backing off instead of retrying.
+_RETRY_STATUSES = (500, 502, 503, 504)
+
+async def _fetch_json(session, url, params, headers=None, retries=2, backoff=1.5):
+    """GET ``url`` and decode the body with orjson.
+
+    Returns a tuple of (status, Last-Modified header, decoded body).  For a
+    ``304 Not Modified`` reply the header and body are ``None``.  Connection
+    failures and transient 5xx replies are retried up to ``retries`` times
+    with exponential backoff (``backoff``, ``2 * backoff``, ...); any other
+    error status raises ``aiohttp.ClientResponseError``.
+    """
+    for attempt in range(retries + 1):
+        last_attempt = attempt == retries
+        try:
+            async with session.get(url, params=params, headers=headers) as response:
+                if response.status == 304:
+                    return 304, None, None
+                if response.status not in _RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()
+                    return response.status, response.headers.get("Last-Modified"), orjson.loads(await response.read())
+        except aiohttp.ClientConnectionError:
+            if last_attempt:
+                raise
+        await asyncio.sleep(backoff * 2 ** attempt)
+
+def _retry_after(headers, failures):
+    """Seconds to wait after a 429, from ``Retry-After`` or exponential backoff."""
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (AttributeError, TypeError, ValueError):
+        return min(60.0, 1.5 * 2 ** failures)
+
+@st.cache_resource
+def _http_state():
+    """Shared state for requests to the Coingecko price endpoint.
+
+    Holds the ``Last-Modified`` header and body of the last successful
+    response, so that a ``304 Not Modified`` reply can reuse it and so
+    that failures can fall back to it, plus the rate-limit backoff state.
+    """
+    return {"last_modified": None, "data": None, "retry_at": 0.0, "failures": 0}
+
+@st.cache_data(ttl=55, show_spinner=False)
 def fetch_prices():
+    """Fetch current prices for all coins from Coingecko.
+
+    Returns a dictionary mapping each coin ID to a tuple of (price, last
+    updated epoch seconds).  The API is queried only once per call for all
+    coins, which minimises network overhead, and the result is cached for
+    slightly less than the refresh interval so that reruns triggered by
+    user interaction do not hit the API (and its rate limit) again.
+
+    If the request fails, or the API is rate limiting us, the last
+    successful response is returned instead (stale-while-revalidate), so
+    the histories keep ticking rather than missing a sample.  After a 429
+    no request is made until the ``Retry-After`` delay has passed.
+    """
     ids = ",".join(COINS)
     url = "https://api.coingecko.com/api/v3/simple/price"
     params = {
@@ -43,11 +173,31 @@ def fetch_prices():
         "vs_currencies": "usd",
         "include_last_updated_at": "true",
     }
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-    except Exception:
+    state = _http_state()
+    data = state["data"]
+    if time.time() >= state["retry_at"]:
+        headers = {}
+        if state["last_modified"] and data is not None:
+            headers["If-Modified-Since"] = state["last_modified"]
+        try:
+            status, last_modified, body = _run(_fetch_json(_client_session(), url, params, headers))
+        except aiohttp.ClientResponseError as exc:
+            if exc.status == 429:
+                state["retry_at"] = time.time() + _retry_after(exc.headers, state["failures"])
+                state["failures"] += 1
+        except Exception:
+            # Any other network error: fall through to the last known data
+            pass
+        else:
+            if status == 304 or isinstance(body, dict):
+                state["failures"] = 0
+                if status != 304:
+                    state["last_modified"] = last_modified
+                    state["data"] = data = body
+            # Otherwise the body is not a JSON object; like any other
+            # failure, fall through to the last known data
+    if data is None:
+        # Nothing fetched yet; the caller will wait for the next refresh
         return {}
     prices = {}
     for coin in COINS:
@@ -58,50 +208,245 @@ def fetch_prices():
         updated_at = info.get("last_updated_at")
         if price is None or updated_at is None:
             continue
-        prices[coin] = (price, datetime.utcfromtimestamp(updated_at))
+        prices[coin] = (price, int(updated_at))
     return prices
 
+# Number of samples retained per coin.  At one update per minute this is
+# roughly an hour of data.
+HISTORY_LEN = 60
+
+def new_history():
+    """Create an empty fixed-size price history for a single coin.
+
+    Histories are stored as a structure of arrays: ``t`` holds epoch
+    seconds, ``p`` holds prices and ``n`` counts the total number of
+    samples written.  The arrays are used as a ring buffer, so sample
+    ``n`` is written to slot ``n % HISTORY_LEN``.
+    """
+    return {
+        "t": np.empty(HISTORY_LEN, dtype=np.int64),
+        "p": np.empty(HISTORY_LEN, dtype=np.float64),
+        "n": 0,
+    }
+
+def ordered_history(history):
+    """Return the (times, prices) arrays of a history, oldest first."""
+    n = history["n"]
+    if n <= HISTORY_LEN:
+        return history["t"][:n], history["p"][:n]
+    start = n % HISTORY_LEN
+    t, p = history["t"], history["p"]
+    return np.concatenate((t[start:], t[:start])), np.concatenate((p[start:], p[:start]))
+
 def update_histories(prices, histories):
-    now = datetime.utcnow()
+    """Append the latest price data to the history for each coin.
+
+    Args:
+        prices: mapping of coin -> (price, updated_at epoch seconds)
+        histories: defaultdict of coin -> ring buffer created by ``new_history``
+
+    Samples are stamped with the local time as integer epoch seconds, the
+    same representation the prediction kernel compares against, so no
+    datetime objects are created per sample.  Each history keeps the last
+    ``HISTORY_LEN`` samples; once full, the oldest sample is overwritten
+    in place so no reallocation occurs.
+    """
+    now = int(time.time())
     for coin, (price, _) in prices.items():
-        entry = {"time": now, "price": price}
-        histories.setdefault(coin, []).append(entry)
-        if len(histories[coin]) > 60:
-            histories[coin] = histories[coin][-60:]
-
-def compute_predictions(histories):
-    results = []
-    now = datetime.utcnow()
-    for coin, history in histories.items():
-        if len(history) < 2:
+        history = histories[coin]
+        i = history["n"] % HISTORY_LEN
+        history["t"][i] = now
+        history["p"][i] = price
+        history["n"] += 1
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_backfill():
+    """Fetch the last day of prices for every coin from Coingecko.
+
+    Returns a mapping of coin -> (epoch seconds, prices) arrays, oldest
+    first.  One ``market_chart`` request is made per coin and all of them
+    run concurrently, so the cost is roughly a single round trip.  Coins
+    whose request fails are left out.  The result is shared between
+    sessions for a few minutes to stay within the API's rate limit.
+    """
+    url = "https://api.coingecko.com/api/v3/coins/{}/market_chart"
+    # The public API picks the granularity itself (five minutes for one
+    # day); explicit minutely intervals are reserved for paid plans.
+    params = {"vs_currency": "usd", "days": "1"}
+    session = _client_session()
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(_fetch_json(session, url.format(coin), params) for coin in COINS),
+            return_exceptions=True,
+        )
+
+    try:
+        results = _run(fetch_all())
+    except Exception:
+        return {}
+    backfill = {}
+    for coin, result in zip(COINS, results):
+        if isinstance(result, BaseException) or not isinstance(result[2], dict):
             continue
-        current_price = history[-1]["price"]
-        def pct_change_over(minutes):
-            cutoff = now - timedelta(minutes=minutes)
-            old_entry = None
-            for entry in history:
-                if entry["time"] <= cutoff:
-                    old_entry = entry
-                    break
-            if not old_entry:
-                return 0.0
-            old_price = old_entry["price"]
-            return (current_price - old_price) / old_price if old_price > 0 else 0.0
-        r1 = pct_change_over(1)
-        r5 = pct_change_over(5)
-        r15 = pct_change_over(15)
-        projected_change = 0.5 * r1 * (30/1) + 0.3 * r5 * (30/5) + 0.2 * r15 * (30/15)
-        projected_gain_pct = projected_change * 100.0
-        confidence = 1.0 / (1.0 + math.exp(-(projected_gain_pct - 5.0)))
-        results.append({
-            "coin": coin,
-            "projected_gain": projected_gain_pct,
-            "confidence": confidence,
-        })
-    return results
+        # "prices" is a list of [milliseconds, usd] pairs
+        points = np.asarray(result[2].get("prices") or [], dtype=np.float64).reshape(-1, 2)
+        if len(points):
+            backfill[coin] = ((points[:, 0] // 1000).astype(np.int64), points[:, 1])
+    return backfill
+
+def bootstrap_histories(histories):
+    """Prime empty histories with recent prices so predictions start at once.
+
+    Without this the 15 minute return is unavailable until a quarter of an
+    hour of samples has been collected.  Only the most recent
+    ``HISTORY_LEN`` points of the backfill are kept.  The backfill points
+    are five minutes apart, which covers the 5 and 15 minute windows; the
+    kernel ignores them for the 1 minute window (see
+    ``kernel._pct_change_over``) until live samples arrive.
+    """
+    now = int(time.time())
+    for coin, (times, prices) in fetch_backfill().items():
+        history = histories[coin] = new_history()
+        n = min(len(times), HISTORY_LEN)
+        # Clamp to the local clock so live samples appended afterwards
+        # keep the time axis sorted.
+        history["t"][:n] = np.minimum(times[-n:], now)
+        history["p"][:n] = prices[-n:]
+        history["n"] = n
+
+def compute_predictions(histories, coins=None, now=None):
+    """Compute projected gains and confidence for each coin.
+
+    The function looks at the past 1, 5 and 15 minute returns and
+    extrapolates a simple linear estimate of the price change over the
+    next 30 minutes.  A confidence score is computed using a logistic
+    transformation of the projected gain relative to the 5% threshold.
+    The per-coin arithmetic is done by the ``project`` kernel.
+
+    Args:
+        histories: mapping of coin -> ring buffer created by ``new_history``
+        coins: optional subset of coins to compute; defaults to all
+        now: epoch seconds the lookback windows are measured from;
+            defaults to the current time
+
+    Returns:
+        dict of equal-length arrays keyed by coin, projected_gain (percent)
+        and confidence; empty if no coin has enough history yet.
+    """
+    if coins is None:
+        coins = histories.keys()
+    if now is None:
+        now = int(time.time())
+    # Coins with fewer than two samples do not have enough data yet
+    coins = [coin for coin in coins if coin in histories and histories[coin]["n"] >= 2]
+    if not coins:
+        return {}
+    prices = np.stack([histories[coin]["p"] for coin in coins])
+    times = np.stack([histories[coin]["t"] for coin in coins])
+    n_per_coin = np.array([histories[coin]["n"] for coin in coins], dtype=np.int64)
+    gains, confidences = project(prices, times, n_per_coin, now)
+    return {
+        "coin": np.array(coins),
+        "projected_gain": gains,
+        "confidence": confidences,
+    }
+
+def merge_predictions(predictions, updates):
+    """Return ``predictions`` with the coins in ``updates`` replaced."""
+    if not predictions:
+        return updates
+    if not updates:
+        return predictions
+    keep = ~np.isin(predictions["coin"], updates["coin"])
+    return {key: np.concatenate((values[keep], updates[key])) for key, values in predictions.items()}
+
+def _last_price(history):
+    """Return the most recent price in a history."""
+    return history["p"][(history["n"] - 1) % HISTORY_LEN]
+
+def _evicts_reference(history, now):
+    """Whether appending to ``history`` would drop a lookback reference.
+
+    Once the ring buffer is full, the next append overwrites the oldest
+    sample.  If that sample is the newest one at or before one of the
+    1, 5 or 15 minute cutoffs (i.e. the next sample is already past the
+    cutoff), predictions computed before the append no longer hold.
+    """
+    n = history["n"]
+    if n < HISTORY_LEN:
+        return False
+    oldest = history["t"][n % HISTORY_LEN]
+    second = history["t"][(n + 1) % HISTORY_LEN]
+    return any(oldest <= now - 60 * minutes < second for minutes in (1, 5, 15))
+
+@st.cache_resource
+def _prediction_pool():
+    """Worker threads for computing predictions alongside the price fetch.
+
+    This is deliberately separate from the background event loop's default
+    executor, which aiohttp uses for DNS resolution: sessions waiting on
+    each other there could starve the one request that has to resolve.
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="surge-predict")
+
+def refresh(histories):
+    """Fetch the latest prices, append them and return fresh predictions.
+
+    The network fetch is I/O bound, so predictions over the history as it
+    stands are computed on ``_prediction_pool`` while this thread fetches
+    the prices.  Once the prices arrive only the coins whose price
+    changed, that are new, or whose append evicts a sample used as a
+    lookback reference are recomputed.  For the others the appended
+    sample has the same price, the reference samples are unchanged and
+    both runs use the same ``now``, so the earlier result is still exact.
+
+    Returns the newly fetched prices and the predictions.
+    """
+    now = int(time.time())
+    pending = _prediction_pool().submit(compute_predictions, histories, now=now)
+    # fetch_prices runs on the script thread so st.cache_data has its
+    # script run context; compute_predictions makes no Streamlit calls.
+    prices = fetch_prices()
+    predictions = pending.result()
+    if not prices:
+        return prices, predictions
+    known = set(predictions["coin"]) if predictions else set()
+    moved = [
+        coin
+        for coin, (price, _) in prices.items()
+        if coin not in known
+        or _last_price(histories[coin]) != price
+        or _evicts_reference(histories[coin], now)
+    ]
+    update_histories(prices, histories)
+    if moved:
+        predictions = merge_predictions(predictions, compute_predictions(histories, moved, now))
+    return prices, predictions
 
 def format_coin_name(coin_id: str) -> str:
-    return coin_id.replace("binancecoin", "Binance Coin").replace("ripple", "XRP").title()
+    """Convert a Coingecko coin ID into a human‑friendly name."""
+    return DISPLAY_NAMES.get(coin_id) or coin_id.replace("-", " ").title()
+
+@st.cache_data(show_spinner=False, max_entries=4 * len(COINS))
+def _chart_data(coin, n, last_t, _history):
+    """Return the last hour of a coin's history as chart columns.
+
+    The cache key is ``(coin, n, last_t)``: the history itself is not
+    hashed (Streamlit skips arguments starting with an underscore), since
+    any new sample changes its write count and latest timestamp.  A new
+    tick therefore only rebuilds the chart data of coins that changed.
+    """
+    times, prices = ordered_history(_history)
+    # Only display the last 60 minutes.  Times are sorted, so the start of
+    # the window is found by binary search.
+    start = np.searchsorted(times, last_t - 60 * 60, side="left")
+    return {"time": times[start:].astype("datetime64[s]"), "price": prices[start:]}
+
+# Optional sections of the dashboard.  The table of top candidates is
+# always shown; set these to False for a more compact page.
+SHOW_PRICE_CHARTS = True
+SHOW_FOOTER = True
 
 def main():
     st.set_page_config(page_title="Crypto Surge Monitor", layout="wide")
@@ -109,39 +454,65 @@ def main():
     st.markdown(
         "This dashboard monitors selected cryptocurrencies in real time and "
         "projects which ones are most likely to surge by **5% or more** "
-        "in the next 30 minutes. Predictions are refreshed every minute."
+        "in the next 30 minutes.  Predictions are refreshed every minute.",
     )
 
-    # manual refresh: use session state as a simple counter to trigger reruns
-    if "autorefresh" not in st.session_state:
-        st.session_state.autorefresh = 0
-    st.session_state.autorefresh += 1
+    # Auto refresh the page every 60 seconds
+    st_autorefresh(interval=60_000, key="surge_tick")
 
+    # Initialise or update price histories in session state
     if "price_histories" not in st.session_state:
-        st.session_state.price_histories = {}
-
-    prices = fetch_prices()
-    if prices:
-        update_histories(prices, st.session_state.price_histories)
+        st.session_state.price_histories = defaultdict(new_history)
+    # On a cold start, backfill so predictions are available immediately
+    if not st.session_state.price_histories:
+        bootstrap_histories(st.session_state.price_histories)
 
-    predictions = compute_predictions(st.session_state.price_histories)
+    # Fetch latest prices, update histories and compute predictions
+    _, predictions = refresh(st.session_state.price_histories)
     if predictions:
-        predictions_sorted = sorted(predictions, key=lambda x: x["confidence"], reverse=True)
-        top = predictions_sorted[:5]
-        if top:
-            table_rows = []
-            for item in top:
-                row = {
-                    "Coin": format_coin_name(item["coin"]),
-                    "Projected Gain (%)": f"{item['projected_gain']:.2f}",
-                    "Confidence (%)": f"{item['confidence']*100:.1f}",
-                }
-                table_rows.append(row)
-            st.table(table_rows)
-        else:
-            st.info("No coins predicted to surge by 5% or more.")
+        gain = predictions["projected_gain"]
+        confidence = predictions["confidence"]
+        # Rank by projected gain, then confidence, both descending.  Coins
+        # with a projected gain >= 5% always rank first, so the top five
+        # covers both those and the fallback when fewer meet the threshold.
+        top = heapq.nlargest(5, range(len(gain)), key=lambda i: (gain[i], confidence[i]))
+        top_coins = [predictions["coin"][i] for i in top]
+        # Display top candidates
+        st.subheader("Top projected surges (next 30 minutes)")
+        # Format each column in one pass and hand the columns to st.table
+        st.table(
+            {
+                "Coin": [format_coin_name(coin_id) for coin_id in top_coins],
+                "Projected Gain (%)": [f"{gain[i]:.2f}" for i in top],
+                "Confidence (%)": [f"{confidence[i] * 100:.1f}" for i in top],
+            }
+        )
+
+        if SHOW_PRICE_CHARTS:
+            # Plot price history for the top candidates
+            st.subheader("Price history (last hour)")
+            for coin_id in top_coins:
+                history = st.session_state.price_histories.get(coin_id)
+                if not history or not history["n"]:
+                    continue
+                last_t = int(history["t"][(history["n"] - 1) % HISTORY_LEN])
+                # Use Streamlit's line chart for simplicity
+                st.caption(format_coin_name(coin_id))
+                st.line_chart(
+                    _chart_data(coin_id, history["n"], last_t, history),
+                    x="time",
+                    y="price",
+                    height=200,
+                    use_container_width=True,
+                )
     else:
         st.warning("Collecting data... please wait a minute to accumulate history.")
 
+    if SHOW_FOOTER:
+        st.write(
+            "Prices provided by [Coingecko](https://www.coingecko.com). "
+            "Predictions are for informational purposes only and do not constitute financial advice."
+        )
+
 if __name__ == "__main__":
     main()
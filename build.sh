@@ -0,0 +1,12 @@
+#!/usr/bin/env bash
+# Build script for Render; set the service's build command to ./build.sh.
+# Installs the Python dependencies and compiles the prediction kernel
+# ahead of time, so that the app does not pay for JIT compilation each
+# time a container starts.  app.py falls back to the JIT/pure Python
+# kernel if the compiled one is missing, so a failed build is not fatal.
+
+set -euo pipefail
+
+pip install --no-cache-dir -r requirements.txt
+
+python kernel.py || echo "Ahead-of-time kernel build failed; using the JIT fallback." >&2
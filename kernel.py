@@ -0,0 +1,143 @@
+"""
+Prediction kernel for the Crypto Surge Monitor.
+
+The functions here turn each coin's price history into a projected 30
+minute gain and a confidence score.  They are kept free of Streamlit so
+that they can be compiled in three ways, fastest first:
+
+* ahead of time into the ``surge_kernel`` extension module by running
+  ``python kernel.py`` (see ``build``), which avoids any JIT compilation
+  when the app starts;
+* just in time by Numba when this module is imported;
+* not at all, as plain Python, when Numba is not installed.
+
+app.py picks the first of these that is available.
+"""
+
+import os
+
+import numpy as np
+
+# Numba is optional: without it the kernel below runs as plain Python,
+# which is slower but produces the same results.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+# Weights that extrapolate the 1, 5 and 15 minute returns to 30 minutes:
+# each return is scaled up to the 30 minute horizon (30/1, 30/5, 30/15) and
+# blended 0.5/0.3/0.2.  We weight shorter windows more heavily because they
+# better reflect recent momentum.  Note that projecting short term returns
+# linearly is simplistic and for demonstration only.
+_W = np.array([0.5 * 30 / 1, 0.3 * 30 / 5, 0.2 * 30 / 15])  # [15.0, 1.8, 0.4]
+# Projected gain (percent) at which a coin counts as surging
+_THR = 5.0
+
+@njit("float64(float64[::1], int64[::1], int64, int64, int64, float64)", cache=True, fastmath=True)
+def _pct_change_over(prices, times, n, now, window, current_price):
+    """Return the change over ``window`` seconds before ``now``.
+
+    The reference is the newest sample at or before ``now - window``.
+    ``prices`` and ``times`` are one coin's ring buffers and ``n`` its
+    write count.  The buffer is binary searched in logical (oldest first)
+    order, which is sorted because samples are appended in real time.
+
+    Returns 0.0 if no sample is old enough, or if the reference is more
+    than a further ``window`` older than the cutoff.  Without that bound a
+    sparse history would pass off a much longer return as this window's;
+    for example, with the five-minute backfill points the "1 minute"
+    return would really span up to six minutes yet still get the
+    1-minute weight.  So right after a cold start r1 is 0 until live
+    samples a minute or two apart have been collected, while the 5 and
+    15 minute windows are already covered by the backfill.
+    """
+    cutoff = now - window
+    size = times.shape[0]
+    m = min(n, size)
+    start = (n - m) % size
+    lo, hi = 0, m
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if times[(start + mid) % size] <= cutoff:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo == 0 or cutoff - times[(start + lo - 1) % size] > window:
+        return 0.0
+    old_price = prices[(start + lo - 1) % size]
+    return (current_price - old_price) / old_price if old_price > 0 else 0.0
+
+@njit("float64(float64)", cache=True, fastmath=True)
+def _sigmoid(x):
+    """Numerically stable logistic function.
+
+    Only ever exponentiates a non-positive number, so ``exp`` cannot
+    overflow for large gains or losses.
+    """
+    if x >= 0.0:
+        return 1.0 / (1.0 + np.exp(-x))
+    z = np.exp(x)
+    return z / (1.0 + z)
+
+# Signature shared by the JIT and ahead-of-time builds of ``project``
+PROJECT_SIGNATURE = "Tuple((float64[::1], float64[::1]))(float64[:,::1], int64[:,::1], int64[::1], int64)"
+
+@njit(PROJECT_SIGNATURE, cache=True, fastmath=True, nogil=True)
+def project(prices, times, n_valid, now):
+    """Projection kernel over the stacked ring buffers of several coins.
+
+    Row ``c`` of ``prices`` and ``times`` is one coin's history with
+    ``n_valid[c]`` samples written.  Returns two arrays with one entry per
+    coin: the projected gain (percent) and its confidence.  The explicit
+    signature makes Numba compile at import time, and ``cache=True``
+    stores the machine code on disk so Streamlit reloads do not recompile
+    it.  The kernel releases the GIL so it can overlap with the price
+    fetch in ``refresh``.
+    """
+    size = times.shape[1]
+    gains = np.empty(prices.shape[0])
+    confidences = np.empty(prices.shape[0])
+    for c in range(prices.shape[0]):
+        n = n_valid[c]
+        current_price = prices[c, (n - 1) % size]
+        # Calculate returns over different windows
+        r1 = _pct_change_over(prices[c], times[c], n, now, 60 * 1, current_price)
+        r5 = _pct_change_over(prices[c], times[c], n, now, 60 * 5, current_price)
+        r15 = _pct_change_over(prices[c], times[c], n, now, 60 * 15, current_price)
+        # Extrapolate returns to 30 minutes (see _W)
+        projected_change = _W[0] * r1 + _W[1] * r5 + _W[2] * r15
+        projected_gain_pct = projected_change * 100.0
+        gains[c] = projected_gain_pct
+        # Compute a pseudo‑confidence: logistic function around the
+        # threshold.  A projected gain equal to _THR yields 0.5.
+        confidences[c] = _sigmoid(projected_gain_pct - _THR)
+    return gains, confidences
+
+def build(output_dir=None):
+    """Compile ``project`` ahead of time into the ``surge_kernel`` module.
+
+    The extension is written next to this file unless ``output_dir`` is
+    given, where app.py will find it.  It also exports ``kernel_version``,
+    a hash of this file's source, so that app.py can ignore an extension
+    built from an older kernel.py (see kernel_version.py).  Requires Numba.
+    """
+    from numba.pycc import CC
+
+    from kernel_version import kernel_source_hash
+
+    version = kernel_source_hash()
+
+    def kernel_version():
+        return version
+
+    cc = CC("surge_kernel")
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc.export("project", PROJECT_SIGNATURE)(project.py_func)
+    # Stamp the extension so app.py can tell when it is out of date
+    cc.export("kernel_version", "int64()")(kernel_version)
+    cc.compile()
+
+if __name__ == "__main__":
+    build()
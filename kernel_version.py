@@ -0,0 +1,33 @@
+"""
+Version check for the ahead-of-time compiled prediction kernel.
+
+``python kernel.py`` stamps the ``surge_kernel`` extension with a hash of
+kernel.py's source.  An extension built from an older kernel.py would
+otherwise keep loading silently, so the stamp is compared here before
+the compiled kernel is used.  This module deliberately does not import
+kernel.py, which would trigger Numba's JIT compilation and defeat the
+point of the ahead-of-time build.
+"""
+
+import hashlib
+import os
+
+KERNEL_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kernel.py")
+
+def kernel_source_hash():
+    """Return a hash of kernel.py that fits in a signed 64-bit integer."""
+    with open(KERNEL_SOURCE, "rb") as f:
+        return int(hashlib.sha256(f.read()).hexdigest()[:15], 16)
+
+def load_aot_kernel():
+    """Return ``surge_kernel.project`` if it was built from this kernel.py.
+
+    Returns ``None`` if the extension is missing, predates the version
+    stamp, or was built from a different kernel.py.
+    """
+    try:
+        import surge_kernel
+        current = surge_kernel.kernel_version() == kernel_source_hash()
+    except (ImportError, AttributeError):
+        return None
+    return surge_kernel.project if current else None
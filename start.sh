@@ -2,13 +2,22 @@
 # Entrypoint script for Render.  Render sets the PORT environment variable
 # automatically on deployment; Streamlit must be told to bind to this port
 # and to listen on all interfaces.  This script installs any missing
-# Python dependencies (in case pip install in the build phase failed) and
-# launches the Streamlit app.
+# Python dependencies (in case pip install in the build phase failed),
+# compiles the prediction kernel if build.sh has not, and launches the
+# Streamlit app.
 
 set -euo pipefail
 
 pip install --no-cache-dir -r requirements.txt
 
+# The prediction kernel is normally compiled ahead of time by build.sh.
+# Only compile it here if that did not happen or kernel.py has changed
+# since; app.py falls back to the JIT/pure Python kernel if this fails,
+# so a failed build is not fatal.
+if ! python -c "import sys, kernel_version; sys.exit(kernel_version.load_aot_kernel() is None)"; then
+    python kernel.py || echo "Ahead-of-time kernel build failed; using the JIT fallback." >&2
+fi
+
 exec streamlit run streamlit_app.py \
     --server.port "$PORT" \
     --server.address 0.0.0.0